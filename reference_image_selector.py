@@ -51,12 +51,47 @@ Author: Generated for production use
 """
 
 import os
+import sys
 import json
+import mmap
+import hashlib
 import shutil
+import tempfile
+import threading
+import time
+import zipfile
 import streamlit as st
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from PIL import Image, ImageOps
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from uuid import uuid4
+from typing import List, Dict, FrozenSet, Optional, Tuple
+
+# Copy-on-write clone support (optional, platform specific)
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+if sys.platform == "darwin":
+    import ctypes
+    try:
+        _clonefile = ctypes.CDLL("libSystem.B.dylib", use_errno=True).clonefile
+        _clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+        _clonefile.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _clonefile = None
+else:
+    _clonefile = None
+
+# Fast JSON (optional) - falls back to the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # =============================================================================
 # CONFIGURATION - Modify these paths as needed
@@ -73,6 +108,26 @@ SOURCE_FOLDER = Path(os.getenv("IMAGE_SELECTOR_SOURCE_FOLDER", BASE_DIR / "outpu
 # Can be overridden with environment variable: IMAGE_SELECTOR_OUTPUT_FOLDER
 OUTPUT_FOLDER = Path(os.getenv("IMAGE_SELECTOR_OUTPUT_FOLDER", BASE_DIR / "selected_reference_images"))
 
+# Deleted selections are moved here and removed in the background
+# (hidden, so it is skipped by all output folder scans)
+TRASH_FOLDER = OUTPUT_FOLDER / ".trash"
+
+# Save staging folders older than this are treated as left over by a crash
+STALE_STAGING_SECONDS = 60 * 60
+
+# Where the latest download ZIP is kept on disk between clicks
+# (hidden and private to this app's output, skipped by all output folder scans)
+ZIP_FOLDER = OUTPUT_FOLDER / ".zips"
+
+# Streamlit's static file folder, served at /app/static/ when
+# server.enableStaticServing is on (see .streamlit/config.toml)
+STATIC_FOLDER = BASE_DIR / "static"
+
+# Disk cache for downscaled preview images shown in the grid
+# Kept inside STATIC_FOLDER so the browser fetches each thumbnail once over HTTP
+# Can be overridden with environment variable: IMAGE_SELECTOR_THUMB_FOLDER
+THUMB_FOLDER = Path(os.getenv("IMAGE_SELECTOR_THUMB_FOLDER", STATIC_FOLDER / "thumbs"))
+
 # DEPLOYMENT NOTES:
 # For multi-user cloud sync (Google Drive/OneDrive/Dropbox):
 # 1. Place this entire folder in your shared cloud folder
@@ -83,6 +138,21 @@ OUTPUT_FOLDER = Path(os.getenv("IMAGE_SELECTOR_OUTPUT_FOLDER", BASE_DIR / "selec
 # Supported image extensions
 SUPPORTED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp", ".tiff"}
 
+# Maximum width/height of grid preview thumbnails
+THUMB_SIZE = (512, 512)
+
+# Image grid rows rendered at first; "Show more" reveals this many more each click
+GRID_ROWS_STEP = 4
+
+# Linux ioctl to share a file's extents with another file (btrfs, XFS reflink)
+FICLONE = 0x40049409
+
+# Buffer size for the read/write copy fallback (shutil's 64 KiB default is too small)
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Reader threads used while building the download ZIP
+ZIP_READ_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
 # Available color options for selection
 COLOR_OPTIONS = [
     "unknown",  # Default if no color selected
@@ -112,29 +182,100 @@ COLOR_OPTIONS = [
 # UTILITY FUNCTIONS
 # =============================================================================
 
-def get_all_product_folders() -> List[Path]:
+def _scan_folder_names(folder_str: str) -> Tuple[str, ...]:
+    """
+    Scan the source directory for product folder names.
+    
+    Args:
+        folder_str: Path of the source directory as a string
+        
+    Returns:
+        Tuple of product folder names, sorted alphabetically (case-insensitive).
+    """
+    # os.scandir reports the entry type from the directory read itself,
+    # so no extra stat() is needed per entry
+    with os.scandir(folder_str) as it:
+        names = [e.name for e in it if e.is_dir(follow_symlinks=False)]
+    
+    # Sort alphabetically for consistent ordering across sessions and users
+    return tuple(sorted(names, key=str.lower))
+
+
+@st.cache_resource(show_spinner=False)
+def _folder_cache() -> Dict:
+    """
+    Process-wide product folder cache, shared by all sessions.
+    
+    Streamlit re-executes this script on every rerun, so plain module globals
+    would not survive; st.cache_resource keeps one dict per server process.
+    Unlike st.cache_data, hits return the same tuple instead of an unpickled copy.
+    
+    Returns:
+        Dict with a lock, the source mtime of the last scan, and the names.
+    """
+    return {"lock": threading.Lock(), "mtime_ns": None, "names": ()}
+
+
+def get_product_names() -> Tuple[str, ...]:
     """
-    Retrieve all product folders from the source directory.
+    Retrieve the names of all product folders in the source directory.
     
     Returns:
-        List of Path objects representing product folders, sorted alphabetically.
+        Tuple of product folder names, sorted alphabetically. Build a Path
+        with SOURCE_FOLDER / name only for the product actually shown.
         
     Note:
         Only directories are returned. Files (like .zip) are ignored.
+        The source folder is scanned once for all users and rescanned only
+        when its mtime changes or the "Refresh list" button resets the cache.
     """
-    if not SOURCE_FOLDER.exists():
-        return []
+    try:
+        mtime_ns = os.stat(SOURCE_FOLDER).st_mtime_ns
+    except FileNotFoundError:
+        return ()
     
-    # Get only directories, not files
-    folders = [f for f in SOURCE_FOLDER.iterdir() if f.is_dir()]
+    cache = _folder_cache()
+    if cache["mtime_ns"] == mtime_ns:
+        return cache["names"]
     
-    # Sort alphabetically for consistent ordering across sessions and users
-    folders.sort(key=lambda x: x.name.lower())
+    # Only one session rescans; the others wait and reuse its result
+    with cache["lock"]:
+        if cache["mtime_ns"] != mtime_ns:
+            cache["names"] = _scan_folder_names(str(SOURCE_FOLDER))
+            cache["mtime_ns"] = mtime_ns
+        return cache["names"]
+
+
+@st.cache_data(show_spinner=False)
+def _images(folder_str: str, mtime_ns: int) -> Tuple[Tuple[str, ...], Tuple[int, ...]]:
+    """
+    Scan a product folder for image files (cached).
+    
+    Plain strings and ints are cached rather than Path objects, which keeps
+    the cache small and cheap to copy out on each rerun.
+    
+    Args:
+        folder_str: Path of the product folder as a string
+        mtime_ns: Modification time of the product folder, used as cache key
+        
+    Returns:
+        Tuple of (image file names sorted by name, matching image mtimes in ns).
+    """
+    with os.scandir(folder_str) as it:
+        entries = [
+            e for e in it
+            if e.is_file(follow_symlinks=False)
+            and os.path.splitext(e.name)[1].lower() in SUPPORTED_EXTENSIONS
+        ]
     
-    return folders
+    # Sort by filename for consistent ordering
+    entries.sort(key=lambda e: e.name.lower())
+    
+    # Take mtimes from the DirEntry now so the grid never has to stat images
+    return tuple(e.name for e in entries), tuple(e.stat().st_mtime_ns for e in entries)
 
 
-def get_images_in_folder(folder_path: Path) -> List[Path]:
+def get_images_in_folder(folder_path: Path) -> Tuple[Tuple[str, ...], Tuple[int, ...]]:
     """
     Get all image files in a product folder.
     
@@ -142,34 +283,345 @@ def get_images_in_folder(folder_path: Path) -> List[Path]:
         folder_path: Path to the product folder
         
     Returns:
-        List of Path objects for image files, sorted by name.
+        Tuple of parallel tuples: image file names sorted by name, and their
+        modification times in nanoseconds. Build a Path with
+        folder_path / name only where one is needed.
     """
-    if not folder_path.exists():
-        return []
+    try:
+        mtime_ns = os.stat(folder_path).st_mtime_ns
+    except FileNotFoundError:
+        return (), ()
     
-    images = []
-    for item in folder_path.iterdir():
-        if item.is_file() and item.suffix.lower() in SUPPORTED_EXTENSIONS:
-            images.append(item)
+    return _images(str(folder_path), mtime_ns)
+
+
+def _static_url(file_path: Path) -> str:
+    """
+    Get the URL to show a file with st.image.
     
-    # Sort by filename for consistent ordering
-    images.sort(key=lambda x: x.name.lower())
+    Files inside STATIC_FOLDER are served by Streamlit's static file server
+    (browser-cached, no per-rerun work on the server) when static serving is
+    enabled. Anything else is returned as a plain path.
+    
+    Args:
+        file_path: Path of the file to display
+        
+    Returns:
+        A /app/static/ URL, or the file path as a string.
+    """
+    if st.get_option("server.enableStaticServing"):
+        try:
+            relative = file_path.resolve().relative_to(STATIC_FOLDER.resolve())
+        except ValueError:
+            pass
+        else:
+            return f"/app/static/{relative.as_posix()}"
+    
+    return str(file_path)
+
+
+@st.cache_resource(show_spinner=False)
+def _thumb(path_str: str, mtime_ns: int) -> str:
+    """
+    Get a downscaled WebP preview of an image, creating it on first use.
+    
+    Thumbnails are written to THUMB_FOLDER, so they survive app restarts;
+    the in-memory cache avoids even the existence check on reruns.
+    
+    Args:
+        path_str: Path of the source image as a string
+        mtime_ns: Modification time of the source image, used as cache key
+        
+    Returns:
+        Static URL (or path) of the thumbnail, ready to pass to st.image.
+    """
+    key = hashlib.sha1((path_str + str(mtime_ns)).encode("utf-8")).hexdigest()
+    thumb_path = THUMB_FOLDER / f"{key}.webp"
+    
+    if not thumb_path.exists():
+        THUMB_FOLDER.mkdir(parents=True, exist_ok=True)
+        
+        with Image.open(path_str) as img:
+            # Browsers honour EXIF orientation, so bake it into the thumbnail
+            img = ImageOps.exif_transpose(img)
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+            img.thumbnail(THUMB_SIZE, Image.Resampling.LANCZOS)
+            
+            # Write to temp file first so concurrent sessions never see a partial file
+            temp_file = THUMB_FOLDER / f".{key}.{os.getpid()}.tmp"
+            img.save(temp_file, "WEBP", quality=80)
+            temp_file.replace(thumb_path)
+    
+    return _static_url(thumb_path)
+
+
+@st.cache_data(show_spinner=False)
+def completed_set(output_mtime_ns: int) -> FrozenSet[str]:
+    """
+    Collect the names of all products that have already been processed (cached).
+    
+    Args:
+        output_mtime_ns: Modification time of the output folder, used as cache key
+        
+    Returns:
+        Frozenset of product names whose output folder contains selection.json.
+    """
+    with os.scandir(OUTPUT_FOLDER) as it:
+        return frozenset(
+            e.name for e in it
+            if e.is_dir() and not e.name.startswith(".")
+            and os.path.isfile(os.path.join(e.path, "selection.json"))
+        )
+
+
+def get_completed_products() -> FrozenSet[str]:
+    """
+    Get the names of all completed products (selection.json exists).
+    
+    Returns:
+        Frozenset of completed product names, empty if nothing was saved yet.
+        
+    Note:
+        The output folder's mtime only changes when product folders are
+        added or removed, so call completed_set.clear() after a save or delete.
+    """
+    try:
+        mtime_ns = os.stat(OUTPUT_FOLDER).st_mtime_ns
+    except FileNotFoundError:
+        return frozenset()
+    
+    return completed_set(mtime_ns)
+
+
+def _dump_json(data: Dict) -> bytes:
+    """
+    Serialize metadata to indented UTF-8 JSON, using orjson when available.
+    
+    Args:
+        data: JSON-serializable dict
+        
+    Returns:
+        Encoded JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _load_json(raw: bytes) -> Dict:
+    """
+    Parse a JSON document, using orjson when available.
+    
+    Args:
+        raw: Encoded JSON document (bytes or a memoryview)
+        
+    Returns:
+        Parsed dict.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(bytes(raw))
+
+
+def _write_durable(path: Path, data: bytes) -> None:
+    """
+    Write bytes to a new file and flush them to disk before returning.
+    
+    Uses raw os.open/os.write (no Python file object buffering) and a single
+    fsync, so a following os.replace can never publish an empty file after a crash.
+    
+    Args:
+        path: File to create (must not exist yet)
+        data: Contents to write
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(folder: Path) -> None:
+    """
+    Flush a directory's entries (new files, renames) to disk.
+    
+    No-op on Windows, where directories cannot be opened for fsync.
+    
+    Args:
+        folder: Directory to flush
+    """
+    if os.name != "posix":
+        return
+    
+    fd = os.open(folder, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _load_meta(path: str) -> Dict:
+    """
+    Read a selection.json file without going through a Python file object.
+    
+    The file is memory-mapped and parsed in place, which keeps bulk reads of
+    many small metadata files cheap (e.g. from a ThreadPoolExecutor.map).
+    
+    Args:
+        path: Path of the selection.json file
+        
+    Returns:
+        Parsed selection metadata.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if os.fstat(fd).st_size == 0:
+            raise ValueError(f"Empty metadata file: {path}")
+        
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return _load_json(view)
+    finally:
+        os.close(fd)
+
+
+def _fast_copy(src: Path, dst: Path) -> None:
+    """
+    Copy a file and its metadata, like shutil.copy2 but with a faster data path.
+    
+    Tries a copy-on-write clone first (clonefile on macOS/APFS, FICLONE on
+    Linux btrfs/XFS), which is O(1) regardless of file size. Otherwise tries
+    os.copy_file_range (Linux: in-kernel copy, server-side copy on NFS), then
+    falls back to a read/write loop over a single reusable 1 MiB buffer.
+    The copy is fsynced before returning, so it can be published by a rename.
+    
+    Args:
+        src: Source file path
+        dst: Destination file path (created or truncated)
+    """
+    # clonefile creates dst itself, so it only applies when dst does not exist yet
+    if _clonefile is not None and _clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+        fd = os.open(dst, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        shutil.copystat(src, dst)
+        return
+    
+    with open(src, "rb", buffering=0) as fsrc, open(dst, "wb", buffering=0) as fdst:
+        copied = False
+        
+        if fcntl is not None and sys.platform.startswith("linux"):
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                copied = True
+            except OSError:
+                # Not a CoW filesystem, or src/dst on different filesystems
+                pass
+        
+        if not copied and hasattr(os, "copy_file_range"):
+            try:
+                while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 2**30):
+                    pass
+                copied = True
+            except OSError:
+                # Unsupported here (e.g. cross-device) - restart with plain copy
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+        
+        if not copied:
+            buf = bytearray(COPY_BUFFER_SIZE)
+            view = memoryview(buf)
+            while True:
+                n = fsrc.readinto(buf)
+                if not n:
+                    break
+                # Raw writes may be short (e.g. disk nearly full) - write the rest
+                chunk = view[:n]
+                while chunk:
+                    chunk = chunk[fdst.write(chunk):]
+        
+        os.fsync(fdst.fileno())
+    
+    # Preserve timestamps and permission bits, same as shutil.copy2
+    shutil.copystat(src, dst)
+
+
+@st.cache_resource(show_spinner=False)
+def _background_executor() -> ThreadPoolExecutor:
+    """
+    Single worker thread for slow cleanup work, shared by all sessions.
+    
+    On creation (first page load after a restart) it also purges anything
+    left in TRASH_FOLDER, and stale save staging folders, by a crash or
+    restart before they were cleaned up.
+    
+    Returns:
+        Process-wide ThreadPoolExecutor (survives reruns via st.cache_resource).
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-selector-cleanup")
     
-    return images
+    # Snapshot now, so only leftovers from before this process are swept
+    try:
+        with os.scandir(TRASH_FOLDER) as it:
+            leftovers = [e.path for e in it]
+    except FileNotFoundError:
+        leftovers = []
+    
+    # Staging folders (.<product>.tmp-<hex>) of saves that never finished;
+    # only old ones, since another app instance may share this output folder
+    try:
+        with os.scandir(OUTPUT_FOLDER) as it:
+            now = time.time()
+            leftovers.extend(
+                e.path for e in it
+                if e.name.startswith(".") and ".tmp-" in e.name
+                and e.is_dir(follow_symlinks=False)
+                and now - e.stat(follow_symlinks=False).st_mtime > STALE_STAGING_SECONDS
+            )
+    except FileNotFoundError:
+        pass
+    
+    for path in leftovers:
+        executor.submit(shutil.rmtree, path, ignore_errors=True)
+    
+    return executor
 
 
-def is_product_completed(product_name: str) -> bool:
+def _move_to_trash(folder: Path) -> Path:
     """
-    Check if a product has already been processed (selection.json exists).
+    Move a folder into TRASH_FOLDER (O(1) rename on the same filesystem).
+    
+    The folder can be restored by renaming it back until it is purged.
     
     Args:
-        product_name: Name of the product folder
+        folder: Folder inside OUTPUT_FOLDER to remove
         
     Returns:
-        True if selection.json exists in the output folder for this product.
+        Path of the folder inside TRASH_FOLDER.
+        
+    Raises:
+        FileNotFoundError: If the folder does not exist.
     """
-    selection_file = OUTPUT_FOLDER / product_name / "selection.json"
-    return selection_file.exists()
+    TRASH_FOLDER.mkdir(parents=True, exist_ok=True)
+    trash_path = TRASH_FOLDER / f"{folder.name}-{uuid4().hex}"
+    os.rename(folder, trash_path)
+    return trash_path
+
+
+def _purge_in_background(trash_path: Path) -> None:
+    """
+    Recursively delete a trashed folder on the background thread.
+    
+    Args:
+        trash_path: Path returned by _move_to_trash()
+    """
+    _background_executor().submit(shutil.rmtree, trash_path, ignore_errors=True)
 
 
 def save_selection(
@@ -191,30 +643,21 @@ def save_selection(
     Returns:
         True if successful, False otherwise.
     """
+    product_output_folder = OUTPUT_FOLDER / product_name
+    
+    # Build the whole selection in a hidden temp folder, then swap it into place
+    temp_folder = OUTPUT_FOLDER / f".{product_name}.tmp-{uuid4().hex}"
+    
     try:
-        # Create output folder for this product
-        product_output_folder = OUTPUT_FOLDER / product_name
-        product_output_folder.mkdir(parents=True, exist_ok=True)
-        
-        # Validate all source files exist before copying
-        missing_files = []
-        for img_info in selected_images:
-            source_file = source_folder / img_info["original_file"]
-            if not source_file.exists():
-                missing_files.append(img_info["original_file"])
-        
-        if missing_files:
-            st.error(f"Cannot save: {len(missing_files)} source file(s) missing: {', '.join(missing_files[:3])}")
-            return False
+        OUTPUT_FOLDER.mkdir(parents=True, exist_ok=True)
+        temp_folder.mkdir()
         
         # Check if already completed (prevent accidental overwrite)
-        selection_file = product_output_folder / "selection.json"
-        if selection_file.exists():
+        if os.path.lexists(os.path.join(product_output_folder, "selection.json")):
             overwrite = st.warning("⚠️ This product was already saved. Overwriting will replace previous selection.")
         
         # Process each selected image
         images_metadata = []
-        copied_files = []  # Track for rollback if needed
         
         for idx, img_info in enumerate(selected_images, start=1):
             original_file = img_info["original_file"]
@@ -226,11 +669,16 @@ def save_selection(
             
             # Create new filename: ref_<index>_<color>.<ext>
             new_filename = f"ref_{idx}_{color}{ext}"
-            dest_file = product_output_folder / new_filename
             
-            # Copy file to output folder
-            shutil.copy2(source_file, dest_file)
-            copied_files.append(dest_file)
+            # Copy file to temp folder - a missing source fails fast here
+            try:
+                _fast_copy(source_file, temp_folder / new_filename)
+            except FileNotFoundError as e:
+                if e.filename is None or os.fspath(e.filename) != os.fspath(source_file):
+                    raise
+                shutil.rmtree(temp_folder, ignore_errors=True)
+                st.error(f"Cannot save: source file missing: {original_file}")
+                return False
             
             # Add to metadata
             images_metadata.append({
@@ -249,21 +697,187 @@ def save_selection(
         }
         
         # Write to temp file first, then rename (atomic operation)
-        temp_file = product_output_folder / ".selection.json.tmp"
-        with open(temp_file, "w", encoding="utf-8") as f:
-            json.dump(selection_data, f, indent=2, ensure_ascii=False)
+        temp_file = temp_folder / ".selection.json.tmp"
+        _write_durable(temp_file, _dump_json(selection_data))
         
         # Atomic rename
-        temp_file.replace(selection_file)
+        temp_file.replace(temp_folder / "selection.json")
+        
+        # Images and selection.json are fsynced; make their directory entries durable
+        # too, so the swap below can never publish a folder with missing files
+        _fsync_dir(temp_folder)
+        
+        # Move any previous selection to the trash, then swap the new one in
+        try:
+            old_trash_path = _move_to_trash(product_output_folder)
+        except FileNotFoundError:
+            old_trash_path = None
+        
+        try:
+            os.rename(temp_folder, product_output_folder)
+        except Exception:
+            # Put the previous selection back before rolling back
+            if old_trash_path is not None:
+                os.rename(old_trash_path, product_output_folder)
+            raise
+        
+        # Only purge the previous selection once the new one is in place
+        if old_trash_path is not None:
+            _purge_in_background(old_trash_path)
         
         return True
         
     except Exception as e:
+        # Roll back - the previous selection (if any) is left untouched
+        shutil.rmtree(temp_folder, ignore_errors=True)
         st.error(f"❌ Error saving selection: {str(e)}")
-        # Could add rollback logic here if needed
         return False
 
 
+def _read_entry(entry: Tuple[str, str]) -> Tuple[zipfile.ZipInfo, bytes]:
+    """
+    Read one file for the ZIP archive (runs in a worker thread).
+    
+    Args:
+        entry: Tuple of (file path, archive name)
+        
+    Returns:
+        Tuple of (ZipInfo carrying the file's timestamp, file contents).
+    """
+    path, arcname = entry
+    zinfo = zipfile.ZipInfo.from_file(path, arcname)
+    with open(path, "rb") as f:
+        return zinfo, f.read()
+
+
+def write_selections_zip(zip_path: str) -> int:
+    """
+    Write every saved selection in the output folder to a ZIP archive on disk.
+    
+    Images are stored uncompressed (they are already compressed formats);
+    only metadata such as selection.json is deflated, at the fastest level.
+    Files are read by a small thread pool while the main thread writes the
+    archive (ZipFile itself is not thread-safe).
+    
+    Args:
+        zip_path: Path of the ZIP file to create
+        
+    Returns:
+        Number of completed products (those with a selection.json) archived.
+    """
+    completed_count = 0
+    entries = []  # (file path, archive name)
+    
+    with os.scandir(OUTPUT_FOLDER) as products:
+        for product_entry in products:
+            # Skip non-folders and hidden in-progress save folders
+            if not product_entry.is_dir() or product_entry.name.startswith("."):
+                continue
+            
+            with os.scandir(product_entry.path) as files:
+                for file_entry in files:
+                    if not file_entry.is_file():
+                        continue
+                    
+                    entries.append((file_entry.path, f"{product_entry.name}/{file_entry.name}"))
+                    
+                    if file_entry.name == "selection.json":
+                        completed_count += 1
+    
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED, allowZip64=True) as zip_file, \
+            ThreadPoolExecutor(max_workers=ZIP_READ_WORKERS) as executor:
+        # Keep a bounded window of reads in flight so memory stays flat
+        remaining = iter(entries)
+        pending = deque(
+            executor.submit(_read_entry, entry)
+            for entry in islice(remaining, ZIP_READ_WORKERS * 2)
+        )
+        
+        while pending:
+            zinfo, data = pending.popleft().result()
+            
+            next_entry = next(remaining, None)
+            if next_entry is not None:
+                pending.append(executor.submit(_read_entry, next_entry))
+            
+            ext = os.path.splitext(zinfo.filename)[1].lower()
+            
+            if ext in SUPPORTED_EXTENSIONS:
+                zip_file.writestr(zinfo, data)
+            else:
+                zip_file.writestr(
+                    zinfo,
+                    data,
+                    compress_type=zipfile.ZIP_DEFLATED,
+                    compresslevel=1
+                )
+    
+    return completed_count
+
+
+def _manifest_sig() -> str:
+    """
+    Compute a cheap signature of all saved selections in the output folder.
+    
+    Only each product's selection.json is stat'ed - it is rewritten on every
+    save, so its size and mtime change whenever that product's output changes.
+    
+    Returns:
+        Hex digest identifying the current set of saved selections.
+    """
+    manifest = []
+    with os.scandir(OUTPUT_FOLDER) as products:
+        for product_entry in products:
+            if not product_entry.is_dir() or product_entry.name.startswith("."):
+                continue
+            try:
+                stat = os.stat(os.path.join(product_entry.path, "selection.json"))
+            except FileNotFoundError:
+                continue
+            manifest.append((product_entry.name, stat.st_size, stat.st_mtime_ns))
+    
+    manifest.sort()
+    return hashlib.blake2b(repr(manifest).encode("utf-8"), digest_size=16).hexdigest()
+
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def build_zip(sig: str) -> Tuple[str, int]:
+    """
+    Build the selections ZIP archive on disk (cached).
+    
+    Only the archive's path is cached, so the archive itself never sits in
+    memory between clicks. Archives from older signatures are removed.
+    
+    Args:
+        sig: Manifest signature from _manifest_sig(), used as cache key
+        
+    Returns:
+        Tuple of (path of the ZIP archive, number of completed products).
+    """
+    ZIP_FOLDER.mkdir(mode=0o700, parents=True, exist_ok=True)
+    zip_path = ZIP_FOLDER / f"selected_reference_images_{sig}.zip"
+    
+    # Drop archives built for earlier signatures
+    for old_zip in ZIP_FOLDER.glob("selected_reference_images_*.zip"):
+        if old_zip != zip_path:
+            try:
+                old_zip.unlink(missing_ok=True)
+            except OSError:
+                # Still open for a download elsewhere (Windows) - next rebuild retries
+                pass
+    
+    # Write to temp file first, then rename, so a reader never sees a partial archive
+    temp_path = ZIP_FOLDER / f".{zip_path.name}.{uuid4().hex}.tmp"
+    try:
+        completed_count = write_selections_zip(str(temp_path))
+        temp_path.replace(zip_path)
+    except Exception:
+        temp_path.unlink(missing_ok=True)
+        raise
+    
+    return str(zip_path), completed_count
+
+
 # =============================================================================
 # SESSION STATE INITIALIZATION
 # =============================================================================
@@ -274,9 +888,9 @@ def init_session_state():
     
     This ensures all required state variables exist before use.
     """
-    # Get all product folders - sorted alphabetically for deterministic order
-    if "product_folders" not in st.session_state:
-        st.session_state.product_folders = get_all_product_folders()
+    # Product folder names - sorted alphabetically for deterministic order
+    # (refreshed every rerun, served from cache)
+    st.session_state.product_names = get_product_names()
     
     # Current product index - SINGLE SOURCE OF TRUTH for navigation
     if "current_index" not in st.session_state:
@@ -286,33 +900,39 @@ def init_session_state():
     if "username" not in st.session_state:
         st.session_state.username = ""
     
-    # Track selected images for current product: {filename: {"selected": bool, "color": str}}
-    if "current_selections" not in st.session_state:
-        st.session_state.current_selections = {}
+    # Start the cleanup thread early so its trash sweep runs before any save
+    _background_executor()
     
     # Track if we need to reset selections for new product
     if "last_loaded_product" not in st.session_state:
         st.session_state.last_loaded_product = None
+    
+    # Number of image grid rows rendered for the current product
+    if "visible_rows" not in st.session_state:
+        st.session_state.visible_rows = GRID_ROWS_STEP
+    
+    # Completed product names - refreshed every rerun (cached, one stat call)
+    st.session_state.completed = get_completed_products()
 
 
-def reset_selections_for_product(product_name: str, images: List[Path]):
+def reset_selections_for_product(product_name: str):
     """
     Reset selection state when navigating to a new product.
     
+    Selections live only in the per-image widget state (select_<name> and
+    color_<name> keys), so resetting means dropping those keys.
+    
     Args:
         product_name: Name of the current product
-        images: List of image paths in the product folder
     """
     if st.session_state.last_loaded_product != product_name:
-        # Clear previous selections
-        st.session_state.current_selections = {}
+        # Products often share file names (image_1.jpg), so purge stale widget state
+        for key in list(st.session_state):
+            if key.startswith(("select_", "color_")):
+                del st.session_state[key]
         
-        # Initialize all images as not selected
-        for img in images:
-            st.session_state.current_selections[img.name] = {
-                "selected": False,
-                "color": "unknown"
-            }
+        # Start with only the first rows of the grid rendered
+        st.session_state.visible_rows = GRID_ROWS_STEP
         
         st.session_state.last_loaded_product = product_name
 
@@ -329,7 +949,7 @@ def go_to_previous():
 
 def go_to_next():
     """Navigate to next product. Simple increment."""
-    total = len(st.session_state.product_folders)
+    total = len(st.session_state.product_names)
     st.session_state.current_index = min(total - 1, st.session_state.current_index + 1)
     st.session_state.last_loaded_product = None
 
@@ -358,18 +978,22 @@ def main():
         return
     
     # Check if we have any products
-    if not st.session_state.product_folders:
+    if not st.session_state.product_names:
         st.error("No product folders found in the source directory.")
         return
     
     # Get current product info based on current_index
-    total_products = len(st.session_state.product_folders)
-    current_folder = st.session_state.product_folders[st.session_state.current_index]
-    product_name = current_folder.name
-    product_images = get_images_in_folder(current_folder)
+    total_products = len(st.session_state.product_names)
+    
+    # Keep the index valid if the product list shrank since the last rerun
+    st.session_state.current_index = min(st.session_state.current_index, total_products - 1)
+    
+    product_name = st.session_state.product_names[st.session_state.current_index]
+    current_folder = SOURCE_FOLDER / product_name
+    product_images, image_mtimes = get_images_in_folder(current_folder)
     
     # Reset selections if new product loaded
-    reset_selections_for_product(product_name, product_images)
+    reset_selections_for_product(product_name)
     
     # ==========================================================================
     # HEADER - Product info
@@ -430,52 +1054,48 @@ def main():
         # 3-column grid as specified
         num_cols = 3
         
-        for row_start in range(0, len(product_images), num_cols):
+        # Render only the first visible_rows rows; the rest load on demand
+        num_visible = min(len(product_images), st.session_state.visible_rows * num_cols)
+        
+        for row_start in range(0, num_visible, num_cols):
             cols = st.columns(num_cols)
             
-            for col_idx, img_idx in enumerate(range(row_start, min(row_start + num_cols, len(product_images)))):
-                image_path = product_images[img_idx]
-                image_name = image_path.name
+            for col_idx, img_idx in enumerate(range(row_start, min(row_start + num_cols, num_visible))):
+                image_name = product_images[img_idx]
                 
                 with cols[col_idx]:
                     # Display image
                     try:
-                        st.image(str(image_path), width="stretch")
+                        st.image(
+                            _thumb(os.path.join(current_folder, image_name), image_mtimes[img_idx]),
+                            width="stretch"
+                        )
                     except Exception:
                         st.error(f"Cannot load: {image_name}")
                     
                     st.caption(image_name)
                     
-                    # Initialize selection state if needed
-                    if image_name not in st.session_state.current_selections:
-                        st.session_state.current_selections[image_name] = {
-                            "selected": False,
-                            "color": "unknown"
-                        }
-                    
-                    # Checkbox for selection
+                    # Checkbox for selection (state kept by Streamlit under its key)
                     is_selected = st.checkbox(
                         "Select",
-                        value=st.session_state.current_selections[image_name]["selected"],
                         key=f"select_{image_name}"
                     )
                     
-                    st.session_state.current_selections[image_name]["selected"] = is_selected
-                    
                     # Color dropdown - disabled unless selected
-                    current_color = st.session_state.current_selections[image_name].get("color", "unknown")
-                    color_index = COLOR_OPTIONS.index(current_color) if current_color in COLOR_OPTIONS else 0
-                    
-                    selected_color = st.selectbox(
+                    st.selectbox(
                         "Color",
                         options=COLOR_OPTIONS,
-                        index=color_index,
                         key=f"color_{image_name}",
                         disabled=not is_selected
                     )
-                    
-                    if is_selected:
-                        st.session_state.current_selections[image_name]["color"] = selected_color
+        
+        if num_visible < len(product_images):
+            if st.button(
+                f"⬇️ Show more ({len(product_images) - num_visible} remaining)",
+                key="btn_show_more"
+            ):
+                st.session_state.visible_rows += GRID_ROWS_STEP
+                st.rerun()
     
     st.markdown("---")
     
@@ -483,14 +1103,12 @@ def main():
     # NAVIGATION BUTTONS - Always visible at bottom
     # ==========================================================================
     
-    # Collect selected images for save validation
-    selected_images = []
-    for img_name, sel_info in st.session_state.current_selections.items():
-        if sel_info.get("selected", False):
-            selected_images.append({
-                "original_file": img_name,
-                "color": sel_info.get("color", "unknown")
-            })
+    # Collect selected images for save validation straight from widget state
+    selected_images = [
+        {"original_file": name, "color": st.session_state.get(f"color_{name}", "unknown")}
+        for name in product_images
+        if st.session_state.get(f"select_{name}")
+    ]
     
     # Two-column layout for buttons
     col_btn1, col_btn2 = st.columns(2)
@@ -527,6 +1145,7 @@ def main():
             )
             
             if success:
+                completed_set.clear()
                 st.success(f"✅ Saved {len(selected_images)} image(s)")
                 # Navigate forward
                 go_to_next()
@@ -553,45 +1172,40 @@ def main():
             st.write("Download all completed selections as a ZIP file")
             
             if st.button("🗜️ Generate ZIP", key="btn_generate_zip"):
-                import zipfile
-                from io import BytesIO
-                
-                if not OUTPUT_FOLDER.exists() or not any(OUTPUT_FOLDER.iterdir()):
+                if not st.session_state.completed:
                     st.warning("No selections saved yet!")
                 else:
-                    # Create ZIP in memory
-                    zip_buffer = BytesIO()
-                    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                        for product_folder in OUTPUT_FOLDER.iterdir():
-                            if product_folder.is_dir():
-                                for file in product_folder.iterdir():
-                                    if file.is_file():
-                                        arcname = f"{product_folder.name}/{file.name}"
-                                        zip_file.write(file, arcname)
+                    # Only rebuilt when a selection was saved or deleted
+                    sig = _manifest_sig()
+                    zip_path, completed_count = build_zip(sig)
                     
-                    zip_buffer.seek(0)
+                    try:
+                        zip_data = open(zip_path, "rb")
+                    except FileNotFoundError:
+                        # Replaced by another session's newer archive (or cleaned up) - rebuild
+                        build_zip.clear()
+                        zip_path, completed_count = build_zip(sig)
+                        zip_data = open(zip_path, "rb")
                     
-                    st.download_button(
-                        label="⬇️ Download selected_reference_images.zip",
-                        data=zip_buffer,
-                        file_name=f"selected_reference_images_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
-                        mime="application/zip",
-                        key="btn_download_zip"
-                    )
+                    with zip_data:
+                        st.download_button(
+                            label="⬇️ Download selected_reference_images.zip",
+                            data=zip_data,
+                            file_name=f"selected_reference_images_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+                            mime="application/zip",
+                            key="btn_download_zip"
+                        )
                     
-                    # Show statistics
-                    completed_count = sum(1 for p in OUTPUT_FOLDER.iterdir() if p.is_dir() and (p / "selection.json").exists())
+                    # Show statistics (counted during the ZIP pass)
                     st.success(f"✅ {completed_count} products completed and ready for download")
     
     with col_admin2:
         with st.expander("🗑️ Delete Current Selection"):
             st.write(f"**Product:** {product_name}")
             
-            if is_product_completed(product_name):
-                selection_file = OUTPUT_FOLDER / product_name / "selection.json"
+            if product_name in st.session_state.completed:
                 try:
-                    with open(selection_file, "r", encoding="utf-8") as f:
-                        existing_data = json.load(f)
+                    existing_data = _load_meta(os.path.join(OUTPUT_FOLDER, product_name, "selection.json"))
                     
                     st.info(f"Selected by: {existing_data.get('selected_by', 'Unknown')}")
                     st.info(f"Date: {existing_data.get('timestamp', 'Unknown')}")
@@ -599,8 +1213,8 @@ def main():
                     
                     if st.button("🗑️ Confirm Delete", key="btn_confirm_delete", type="secondary"):
                         try:
-                            product_output_folder = OUTPUT_FOLDER / product_name
-                            shutil.rmtree(product_output_folder)
+                            _purge_in_background(_move_to_trash(OUTPUT_FOLDER / product_name))
+                            completed_set.clear()
                             st.success(f"✅ Deleted selection for {product_name}")
                             st.rerun()
                         except Exception as e:
@@ -611,7 +1225,17 @@ def main():
                 st.info("This product has not been completed yet")
     
     st.markdown("---")
-    st.caption(f"Source: {SOURCE_FOLDER} | Output: {OUTPUT_FOLDER}")
+    
+    col_footer, col_refresh = st.columns([3, 1])
+    
+    with col_footer:
+        st.caption(f"Source: {SOURCE_FOLDER} | Output: {OUTPUT_FOLDER}")
+    
+    with col_refresh:
+        # Rescan the source folder (e.g. when new products were added on a network share)
+        if st.button("🔄 Refresh list", key="btn_refresh_list"):
+            _folder_cache()["mtime_ns"] = None
+            st.rerun()
 
 
 # =============================================================================